@@ -16,14 +16,31 @@
     `latest_pl5_calculation.txt` 中。
 """
 
+import io
 import os
 import re
 import glob
 import csv
+import json
+import functools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import traceback
 from typing import Optional, Tuple, List, Dict
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy 仅用于大规模推荐列表的向量化加速，缺失时走纯Python路径
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    # pandas 仅用于CSV的批量解析加速，缺失时回退到流式逐行解析
+    pd = None
+
 # ==============================================================================
 # --- 配置区 ---
 # ==============================================================================
@@ -34,6 +51,9 @@ REPORT_PATTERN = "pl5_analysis_output_*.txt"
 CSV_FILE = "pl5.csv"
 # 最终生成的主评估报告文件名
 MAIN_REPORT_FILE = "latest_pl5_calculation.txt"
+# 结构化记录的侧车文件 (JSON Lines, 每行一条记录，追加为O(1))
+NORMAL_RECORDS_FILE = "latest_pl5_calculation.normal.jsonl"
+ERROR_RECORDS_FILE = "latest_pl5_calculation.error.jsonl"
 
 # 主报告文件中保留的最大记录数
 MAX_NORMAL_RECORDS = 10  # 保留最近10次评估
@@ -44,6 +64,40 @@ PRIZE_VALUES = {
     "直选": 100000,    # 直选奖金：所选号码与中奖号码相同且顺序一致 (10万元)
 }
 
+# 推荐数量达到该规模时改走NumPy向量化比较
+VECTORIZE_THRESHOLD = 1024
+
+# ==============================================================================
+# --- 预编译正则表达式 ---
+# ==============================================================================
+# 模块加载时编译一次，避免在逐行/逐文件的热循环中重复触发 re 模块的缓存查找。
+
+# CSV期号格式: 4-7位数字
+_PERIOD_RE = re.compile(r'^\d{4,7}$')
+# 分析报告中的数据截止期标记
+_CUTOFF_RE = re.compile(r'分析基于数据:\s*截至\s*(\d+)\s*期')
+# 报告文件名: 可选的截止期段 + 时间戳后缀。若文件名中带有截止期，
+# 扫描时即可直接按文件名过滤，免去打开不匹配文件的开销
+_REPORT_NAME_RE = re.compile(r'pl5_analysis_output_(?:(\d+)_)?(\d{8}_\d{6})\.txt$')
+# str.translate 删除表: 一次C级遍历剔除号码串中的分隔符，只留数字字符
+_SEPARATOR_TABLE = str.maketrans('', '', ' ,[]\t\n')
+# 报告解析的单遍扫描正则: 把预测目标期号、单式推荐行、复式推荐行三类
+# 标记合并为一个交替模式，一次 finditer 线性扫过报告文本即可全部提取，
+# 取代原先对全文的七次独立扫描
+_REPORT_SCAN_RE = re.compile(
+    r'(?P<target>本次预测目标:\s*第\s*(?P<target_period>\d+)\s*期)'
+    r'|(?P<rec>注\s*\d+:\s*\[(?P<rec_nums>[0-9\s,]+)\])'
+    r'|(?P<duplex>第(?P<duplex_pos>[一二三四五])位推荐:\s*\[(?P<duplex_nums>[0-9\s,]+)\])'
+)
+# 复式推荐中文序数 -> 位置键
+_DUPLEX_POS_KEYS = {'一': 'pos1', '二': 'pos2', '三': 'pos3', '四': 'pos4', '五': 'pos5'}
+
+# 把热路径上的Pattern方法绑定为模块级名字: 调用点直接拿到C函数，
+# 省去每次对Pattern对象的属性查找
+_CUTOFF_SEARCH = _CUTOFF_RE.search
+_REPORT_NAME_SEARCH = _REPORT_NAME_RE.search
+_REPORT_SCAN_FINDITER = _REPORT_SCAN_RE.finditer
+
 # ==============================================================================
 # --- 工具函数 ---
 # ==============================================================================
@@ -52,6 +106,15 @@ def log_message(message: str, level: str = "INFO"):
     """一个简单的日志打印函数，用于在控制台显示脚本执行状态。"""
     print(f"[{level}] {datetime.now().strftime('%H:%M:%S')} - {message}")
 
+def _digits_to_str(nums: List[int]) -> str:
+    """
+    把0-9数字列表拼成连续数字串，如 [2, 7, 0, 3, 7] -> "27037"。
+
+    一次bytes构造加ascii解码，取代 ''.join(map(str, ...)) 的逐元素
+    str() 调用开销。
+    """
+    return bytes(48 + n for n in nums).decode('ascii')
+
 def robust_file_read(file_path: str) -> Optional[str]:
     """
     一个健壮的文件读取函数，能自动尝试多种编码格式。
@@ -75,16 +138,88 @@ def robust_file_read(file_path: str) -> Optional[str]:
     log_message(f"无法使用任何支持的编码打开文件: {file_path}", "ERROR")
     return None
 
+def robust_open(file_path: str):
+    """
+    一个健壮的文件打开函数，能自动尝试多种编码格式。
+
+    与 `robust_file_read` 不同，本函数不将整个文件读入内存，而是返回可
+    逐行迭代的文件对象，适合交给 `csv.reader` 流式处理大文件。
+
+    Args:
+        file_path (str): 待打开文件的路径。
+
+    Returns:
+        Optional[TextIO]: 打开的文件对象，如果失败则返回 None。
+    """
+    if not os.path.exists(file_path):
+        log_message(f"文件未找到: {file_path}", "ERROR")
+        return None
+    encodings = ['utf-8', 'gbk', 'latin-1']
+    for encoding in encodings:
+        try:
+            f = open(file_path, 'r', encoding=encoding, newline='')
+        except IOError:
+            continue
+        try:
+            # 预读一小段做解码探测，成功后回到文件开头交给调用方
+            f.read(4096)
+            f.seek(0)
+            return f
+        except UnicodeDecodeError:
+            f.close()
+    log_message(f"无法使用任何支持的编码打开文件: {file_path}", "ERROR")
+    return None
+
+def robust_read_prefix(file_path: str, nbytes: int = 8192) -> Optional[str]:
+    """
+    健壮地读取文件开头最多 `nbytes` 字节并解码。
+
+    与 `robust_file_read` 一样逐个尝试编码，但只读取文件前缀，
+    适合只需要文件头部信息的场景——读取和解码的字节数从整个文件
+    缩减为几KB。
+
+    Args:
+        file_path (str): 待读取文件的路径。
+        nbytes (int): 最多读取的字节数。
+
+    Returns:
+        Optional[str]: 解码后的文件头部内容，失败则返回 None。
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            prefix = f.read(nbytes)
+    except IOError:
+        return None
+    for encoding in ('utf-8', 'gbk', 'latin-1'):
+        try:
+            return prefix.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    # 截断点可能落在多字节字符中间，忽略尾部残缺再解一次
+    return prefix.decode('utf-8', errors='ignore')
+
+@functools.lru_cache(maxsize=64)
+def _read_report_header(file_path: str, mtime: float) -> Optional[str]:
+    """
+    读取报告文件头部，按 (路径, mtime) 缓存。
+
+    "分析基于数据: 截至 X 期" 标记位于报告头部，扫描候选报告时只需
+    `robust_read_prefix` 的前几KB；文件未变动时重复扫描不产生I/O。
+    `mtime` 仅作为缓存键，文件更新后自动失效。
+    """
+    return robust_read_prefix(file_path)
+
 # ==============================================================================
 # --- 数据解析与查找模块 ---
 # ==============================================================================
 
-def get_period_data_from_csv(csv_content: str) -> Tuple[Optional[Dict], Optional[List]]:
+def get_period_data_from_csv(csv_lines) -> Tuple[Optional[Dict], Optional[List]]:
     """
-    从CSV文件内容中解析出所有期号的开奖数据。
+    从CSV行迭代器中解析出所有期号的开奖数据。
 
     Args:
-        csv_content (str): 从CSV文件读取的字符串内容。
+        csv_lines: 可逐行迭代的CSV数据源（文件对象或行列表），
+            通常由 `robust_open` 返回，逐行流式解析以避免整文件驻留内存。
 
     Returns:
         Tuple[Optional[Dict], Optional[List]]:
@@ -92,24 +227,27 @@ def get_period_data_from_csv(csv_content: str) -> Tuple[Optional[Dict], Optional
             - 一个按升序排序的期号列表。
             如果解析失败则返回 (None, None)。
     """
-    if not csv_content:
+    if csv_lines is None:
         log_message("输入的CSV内容为空。", "WARNING")
         return None, None
     period_map, periods_list = {}, []
     try:
-        reader = csv.reader(csv_content.splitlines())
+        reader = csv.reader(csv_lines)
         next(reader)  # 跳过表头
         for i, row in enumerate(reader):
-            if len(row) >= 6 and re.match(r'^\d{4,7}$', row[0]):
-                try:
-                    period, pos_1, pos_2, pos_3, pos_4, pos_5 = row[0], int(row[1]), int(row[2]), int(row[3]), int(row[4]), int(row[5])
-                    # 验证数字范围
-                    if not all(0 <= num <= 9 for num in [pos_1, pos_2, pos_3, pos_4, pos_5]):
-                        continue
-                    period_map[period] = {'numbers': [pos_1, pos_2, pos_3, pos_4, pos_5]}
-                    periods_list.append(period)
-                except (ValueError, IndexError):
-                    log_message(f"CSV文件第 {i+2} 行数据格式无效，已跳过: {row}", "WARNING")
+            if len(row) < 6:
+                continue
+            # 期号校验: 4-7位纯数字。str 方法是单次C级调用，比逐行正则匹配更快
+            period = row[0]
+            if not (4 <= len(period) <= 7 and period.isdigit()):
+                continue
+            # 各位号码必须是单个 '0'-'9' 字符，直接用 ord 转数字，省去5次 int() 构造
+            nums = row[1:6]
+            if not all(len(s) == 1 and '0' <= s <= '9' for s in nums):
+                log_message(f"CSV文件第 {i+2} 行数据格式无效，已跳过: {row}", "WARNING")
+                continue
+            period_map[period] = {'numbers': [ord(s) - 48 for s in nums]}
+            periods_list.append(period)
     except Exception as e:
         log_message(f"解析CSV数据时发生严重错误: {e}", "ERROR")
         return None, None
@@ -120,49 +258,145 @@ def get_period_data_from_csv(csv_content: str) -> Tuple[Optional[Dict], Optional
         
     return period_map, sorted(periods_list, key=int)
 
-def find_matching_report(target_period: str) -> Optional[str]:
+def _get_period_data_pandas(csv_path: str) -> Tuple[Optional[Dict], Optional[List]]:
+    """
+    用 pandas 的C解析器批量解析开奖CSV。
+
+    列式解析加向量化过滤取代逐行的Python循环，行数上万时要快
+    1-2个数量级。任何解析异常都返回 (None, None)，由调用方回退
+    到流式逐行解析。
+    """
+    try:
+        df = pd.read_csv(csv_path, usecols=range(6), header=0,
+                         names=['period', 'p1', 'p2', 'p3', 'p4', 'p5'],
+                         dtype={'period': str}, engine='c')
+        num_cols = ['p1', 'p2', 'p3', 'p4', 'p5']
+        for col in num_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        # 与逐行解析相同的过滤条件: 期号为4-7位数字，各位号码在0-9之间
+        valid = (
+            df['period'].str.match(_PERIOD_RE.pattern, na=False)
+            & df[num_cols].notna().all(axis=1)
+            & df[num_cols].ge(0).all(axis=1)
+            & df[num_cols].le(9).all(axis=1)
+        )
+        df = df[valid]
+        if df.empty:
+            log_message("未能从CSV中解析到任何有效的开奖数据。", "WARNING")
+            return None, None
+        period_map = {
+            period: {'numbers': numbers}
+            for period, numbers in zip(df['period'], df[num_cols].astype(int).values.tolist())
+        }
+        return period_map, sorted(period_map, key=int)
+    except Exception as e:
+        log_message(f"pandas解析CSV失败，回退到逐行解析: {e}", "WARNING")
+        return None, None
+
+def load_period_data(csv_path: str) -> Tuple[Optional[Dict], Optional[List]]:
+    """
+    读取并解析开奖CSV，返回 (期号字典, 升序期号列表)。
+
+    安装了 pandas 时优先走其C解析器的批量路径，失败或不可用时
+    回退到 `robust_open` + `get_period_data_from_csv` 的流式解析。
+    """
+    if pd is not None:
+        period_map, periods_list = _get_period_data_pandas(csv_path)
+        if period_map:
+            return period_map, periods_list
+    csv_file = robust_open(csv_path)
+    if not csv_file:
+        return None, None
+    with csv_file:
+        return get_period_data_from_csv(csv_file)
+
+def find_matching_report(target_period: str) -> Tuple[Optional[str], Optional[str]]:
     """
     在当前目录查找其数据截止期与 `target_period` 匹配的最新分析报告。
 
+    选出最新报告后顺带读取其完整内容一并返回，调用方无需再读一次
+    同一个文件。
+
     Args:
         target_period (str): 目标报告的数据截止期号。
 
     Returns:
-        Optional[str]: 找到的报告文件的路径，如果未找到则返回 None。
+        Tuple[Optional[str], Optional[str]]: (报告文件路径, 报告完整内容)，
+        未找到或读取失败时对应项为 None。
     """
     log_message(f"正在查找数据截止期为 {target_period} 的分析报告...")
-    candidates = []
     script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # 先按文件名过滤: 没有规范时间戳后缀的文件、文件名中已带截止期
+    # 且与目标不符的文件，都无需打开读取
+    survivors = []
     for file_path in glob.glob(os.path.join(script_dir, REPORT_PATTERN)):
-        content = robust_file_read(file_path)
-        if not content: continue
-        
-        match = re.search(r'分析基于数据:\s*截至\s*(\d+)\s*期', content)
-        if match and match.group(1) == target_period:
-            try:
-                timestamp_str_match = re.search(r'_(\d{8}_\d{6})\.txt$', file_path)
-                if timestamp_str_match:
-                    timestamp_str = timestamp_str_match.group(1)
-                    timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                    candidates.append((timestamp, file_path))
-            except (AttributeError, ValueError):
-                continue
-    
+        name_match = _REPORT_NAME_SEARCH(os.path.basename(file_path))
+        if not name_match:
+            continue
+        file_period, timestamp_str = name_match.groups()
+        if file_period is not None and file_period != target_period:
+            continue
+        survivors.append((file_path, timestamp_str))
+
+    def _scan(item):
+        """读取单个候选报告的文件头，确认截止期后返回 (时间戳, 路径)。"""
+        file_path, timestamp_str = item
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return None
+        header = _read_report_header(file_path, mtime)
+        if not header:
+            return None
+        match = _CUTOFF_SEARCH(header)
+        if not (match and match.group(1) == target_period):
+            return None
+        # 时间戳格式固定为 YYYYMMDD_HHMMSS 且已由文件名正则保证是数字，
+        # 直接按位切片转整数元组即可排序，省去 strptime 的格式重解析
+        # 和 datetime 对象构造
+        ts = timestamp_str
+        ts_tuple = (int(ts[0:4]), int(ts[4:6]), int(ts[6:8]),
+                    int(ts[9:11]), int(ts[11:13]), int(ts[13:15]))
+        return (ts_tuple, file_path)
+
+    # 多个候选时并发读取文件头: read() 期间释放GIL，磁盘延迟相互重叠，
+    # N 次串行读取的等待合并为约一次
+    if len(survivors) > 1:
+        with ThreadPoolExecutor(max_workers=min(32, len(survivors))) as executor:
+            results = list(executor.map(_scan, survivors))
+    else:
+        results = [_scan(item) for item in survivors]
+    candidates = [r for r in results if r is not None]
+
     if not candidates:
         log_message(f"未找到数据截止期为 {target_period} 的分析报告。", "WARNING")
-        return None
-        
+        return None, None
+
     candidates.sort(reverse=True)
     latest_report = candidates[0][1]
     log_message(f"找到匹配的最新报告: {os.path.basename(latest_report)}", "INFO")
-    return latest_report
+    return latest_report, robust_file_read(latest_report)
+
+def _extract_digits(numbers_str: str) -> List[int]:
+    """
+    从推荐号码串(如 "1, 6, 5, 3, 7")中提取各个数字。
+
+    先用 str.translate 一次性剔除分隔符，再按字符转数字，
+    避免对每个号码串调用正则引擎。
+    """
+    digits = numbers_str.translate(_SEPARATOR_TABLE)
+    return [ord(c) - 48 for c in digits if '0' <= c <= '9']
 
-def parse_recommendations_from_report(content: str) -> Dict:
+def parse_recommendations_from_report(content: str, parse_duplex: bool = False) -> Dict:
     """
     从分析报告内容中解析出排列五推荐号码（单式和复式）。
 
     Args:
         content (str): 分析报告的文本内容。
+        parse_duplex (bool): 是否同时解析复式推荐。主流程只使用单式
+            推荐，默认跳过复式分支以省去无用功；需要复式数据
+            （如 `format_winning_details` 的复式参考）的调用方显式传 True。
 
     Returns:
         Dict: 包含单式推荐和复式推荐的字典
@@ -178,43 +412,23 @@ def parse_recommendations_from_report(content: str) -> Dict:
         'target_period': ''
     }
     
-    # 解析目标期号
-    target_match = re.search(r'本次预测目标:\s*第\s*(\d+)\s*期', content)
-    if target_match:
-        result['target_period'] = target_match.group(1)
-    
-    # 解析单式推荐号码
-    rec_pattern = re.compile(r'注\s*\d+:\s*\[([0-9\s,]+)\]')
-    for match in rec_pattern.finditer(content):
-        try:
-            numbers_str = match.group(1)
-            numbers = [int(x.strip()) for x in re.findall(r'\d', numbers_str)]
-            if len(numbers) == 5 and all(0 <= num <= 9 for num in numbers):
+    # 单遍扫描: 目标期号、单式推荐、复式推荐在一次 finditer 中全部提取
+    for match in _REPORT_SCAN_FINDITER(content):
+        if match.group('target'):
+            # 与原先的 search 语义一致，以首次出现为准
+            if not result['target_period']:
+                result['target_period'] = match.group('target_period')
+        elif match.group('rec'):
+            numbers = _extract_digits(match.group('rec_nums'))
+            if len(numbers) == 5:
                 result['single'].append(numbers)
-        except ValueError:
-            continue
-    
-    # 解析复式推荐号码
-    duplex_patterns = {
-        'pos1': re.compile(r'第一位推荐:\s*\[([0-9\s,]+)\]'),
-        'pos2': re.compile(r'第二位推荐:\s*\[([0-9\s,]+)\]'),
-        'pos3': re.compile(r'第三位推荐:\s*\[([0-9\s,]+)\]'),
-        'pos4': re.compile(r'第四位推荐:\s*\[([0-9\s,]+)\]'),
-        'pos5': re.compile(r'第五位推荐:\s*\[([0-9\s,]+)\]'),
-    }
-    
-    for pos, pattern in duplex_patterns.items():
-        match = pattern.search(content)
-        if match:
-            try:
-                numbers_str = match.group(1)
-                numbers = [int(x.strip()) for x in re.findall(r'\d', numbers_str)]
-                numbers = [num for num in numbers if 0 <= num <= 9]
+        elif parse_duplex:
+            pos = _DUPLEX_POS_KEYS.get(match.group('duplex_pos'))
+            if pos and pos not in result['duplex']:
+                numbers = _extract_digits(match.group('duplex_nums'))
                 if numbers:
-                    result['duplex'][pos] = sorted(list(set(numbers)))
-            except ValueError:
-                continue
-    
+                    result['duplex'][pos] = sorted(set(numbers))
+
     return result
 
 def calculate_prize(recommendations: List[List[int]], prize_numbers: List[int]) -> Tuple[int, Dict, List]:
@@ -231,26 +445,69 @@ def calculate_prize(recommendations: List[List[int]], prize_numbers: List[int])
     if not recommendations or not prize_numbers or len(prize_numbers) != 5:
         return 0, {}, []
 
+    # 大规模推荐时一次C级向量化比较取代逐注Python循环
+    if np is not None and len(recommendations) >= VECTORIZE_THRESHOLD:
+        return _calculate_prize_vectorized(recommendations, prize_numbers)
+
     total_prize = 0
     prize_stats = {"直选": 0}
     winning_details = []
 
+    # 以元组为键建立 推荐组合 -> 序号列表 的索引。直选只有唯一的中奖
+    # 组合，一次哈希查找即可取代对每注推荐的逐一列表比较
+    rec_index: Dict[tuple, List[int]] = {}
     for i, recommendation in enumerate(recommendations):
         if len(recommendation) != 5:
             continue
+        rec_index.setdefault(tuple(recommendation), []).append(i)
+
+    # 直选中奖（五个位置完全匹配）
+    target = tuple(prize_numbers)
+    for i in rec_index.get(target, []):
+        prize_amount = PRIZE_VALUES["直选"]
+        total_prize += prize_amount
+        prize_stats["直选"] += 1
+
+        winning_details.append({
+            'index': i + 1,
+            'numbers': recommendations[i],
+            'prize_type': '直选',
+            'prize_amount': prize_amount
+        })
 
-        # 检查直选中奖（五个位置完全匹配）
-        if recommendation == prize_numbers:
-            prize_amount = PRIZE_VALUES["直选"]
-            total_prize += prize_amount
-            prize_stats["直选"] += 1
-            
-            winning_details.append({
-                'index': i + 1,
-                'numbers': recommendation,
-                'prize_type': '直选',
-                'prize_amount': prize_amount
-            })
+    return total_prize, prize_stats, winning_details
+
+def _calculate_prize_vectorized(recommendations: List[List[int]], prize_numbers: List[int]) -> Tuple[int, Dict, List]:
+    """
+    calculate_prize 的NumPy向量化实现。
+
+    把推荐组合装入 (N, 5) 的int8数组后，与开奖号码的比较是单次
+    SIMD化的C级操作；int8 相比默认的int64把每行字节数压缩到1/8，
+    等效内存带宽随之提升。结果与纯Python路径完全一致。
+    """
+    valid_idx = [i for i, rec in enumerate(recommendations) if len(rec) == 5]
+    if not valid_idx:
+        return 0, {"直选": 0}, []
+
+    recs = np.asarray([recommendations[i] for i in valid_idx], dtype=np.int8)
+    target = np.asarray(prize_numbers, dtype=np.int8)
+    wins = (recs == target).all(axis=1)
+
+    total_prize = 0
+    prize_stats = {"直选": 0}
+    winning_details = []
+    for j in np.flatnonzero(wins):
+        i = valid_idx[int(j)]
+        prize_amount = PRIZE_VALUES["直选"]
+        total_prize += prize_amount
+        prize_stats["直选"] += 1
+
+        winning_details.append({
+            'index': i + 1,
+            'numbers': recommendations[i],
+            'prize_type': '直选',
+            'prize_amount': prize_amount
+        })
 
     return total_prize, prize_stats, winning_details
 
@@ -273,7 +530,7 @@ def format_winning_details(winning_details: List[Dict], prize_numbers: List[int]
         lines.append(f"预测期号: 第{target_period}期")
     
     # 格式化开奖号码
-    numbers_str = ''.join(map(str, prize_numbers))
+    numbers_str = _digits_to_str(prize_numbers)
     lines.append(f"开奖号码: {numbers_str}")
     
     if not winning_details:
@@ -281,7 +538,7 @@ def format_winning_details(winning_details: List[Dict], prize_numbers: List[int]
     else:
         lines.append(f"恭喜：共有 {len(winning_details)} 注中奖")
         for detail in winning_details:
-            numbers_str = ''.join(map(str, detail['numbers']))
+            numbers_str = _digits_to_str(detail['numbers'])
             lines.append(f"  第{detail['index']}注: {numbers_str} - {detail['prize_type']} - {detail['prize_amount']}元")
     
     # 如果有复式数据，显示复式参考
@@ -294,67 +551,120 @@ def format_winning_details(winning_details: List[Dict], prize_numbers: List[int]
     
     return lines
 
+def _append_record(jsonl_path: str, record: Dict, max_records: int):
+    """
+    向JSONL侧车文件追加一条记录，超出上限时只保留最近的记录。
+
+    Args:
+        jsonl_path (str): JSONL文件路径。
+        record (Dict): 待追加的结构化记录。
+        max_records (int): 文件中保留的最大记录数。
+    """
+    try:
+        with open(jsonl_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except Exception as e:
+        log_message(f"追加记录失败 ({jsonl_path}): {e}", "ERROR")
+        return
+    # 超限时重写一次，只保留末尾 max_records 行。deque(maxlen=N) 在
+    # 逐行读取时自动淘汰旧行，全程只驻留尾部N行而非整个文件
+    try:
+        total = 0
+        tail = deque(maxlen=max_records)
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                total += 1
+                tail.append(line)
+        if total > max_records:
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                f.writelines(tail)
+    except Exception as e:
+        log_message(f"整理记录文件失败 ({jsonl_path}): {e}", "WARNING")
+
+def _load_records(jsonl_path: str, max_records: Optional[int] = None) -> List[Dict]:
+    """
+    读取JSONL侧车文件中的记录。
+
+    Args:
+        jsonl_path (str): JSONL文件路径。
+        max_records (Optional[int]): 最多保留的记录数，
+            借助 deque(maxlen) 在读取时O(1)淘汰更早的记录。
+
+    Returns:
+        List[Dict]: 记录列表，最新的记录排在最前。
+    """
+    if not os.path.exists(jsonl_path):
+        return []
+    # 文件内按时间顺序追加; maxlen 使旧记录在读取时被O(1)淘汰，
+    # 最后只需反转尾部的≤N条记录即得到"最新在前"的展示顺序
+    records = deque(maxlen=max_records)
+    try:
+        with open(jsonl_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except Exception as e:
+        log_message(f"读取记录文件失败 ({jsonl_path}): {e}", "WARNING")
+    records.reverse()
+    return list(records)
+
+def _format_normal_record(record: Dict) -> str:
+    """将一条结构化评估记录格式化为主报告中的可读文本段。"""
+    entry_lines = [
+        f"评估时间: {record.get('time', '未知')}",
+        f"评估期号: {record.get('period', '未知')}",
+        f"开奖号码: {_digits_to_str(record.get('prize_numbers', []))}",
+        f"推荐数量: {record.get('recommendation_count', 0)}注",
+        f"中奖数量: {record.get('winning_count', 0)}注",
+        f"总奖金: {record.get('total_prize', 0):,}元",
+        ""
+    ]
+    if record.get('winning_details'):
+        entry_lines.append("中奖详情:")
+        for detail in record['winning_details']:
+            numbers_str = _digits_to_str(detail['numbers'])
+            entry_lines.append(f"  第{detail['index']}注: {numbers_str} - {detail['prize_type']} - {detail['prize_amount']:,}元")
+        entry_lines.append("")
+    return "\n".join(entry_lines)
+
+def _format_error_record(record: Dict) -> str:
+    """将一条结构化错误记录格式化为主报告中的可读文本段。"""
+    return f"错误时间: {record.get('time', '未知')}\n错误信息: {record.get('message', '')}\n"
+
 def manage_report(new_entry: Optional[Dict] = None, new_error: Optional[str] = None):
     """
     管理主报告文件，维护记录数量限制。
 
+    评估记录与错误日志以JSONL侧车文件持久化：新增记录是O(1)的追加，
+    截断只保留最近N条，再由结构化记录一次性生成可读的主报告文本。
+    相比旧版对整份报告文本的反复切分与子串归类，既避免了O(报告大小)
+    的字符串操作，也消除了按子串猜测记录类型的歧义。
+
     Args:
         new_entry (Optional[Dict]): 新的评估记录
         new_error (Optional[str]): 新的错误信息
     """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     report_path = os.path.join(script_dir, MAIN_REPORT_FILE)
-    
-    # 读取现有内容
-    existing_content = ""
-    if os.path.exists(report_path):
-        try:
-            with open(report_path, 'r', encoding='utf-8') as f:
-                existing_content = f.read()
-        except Exception as e:
-            log_message(f"读取现有报告失败: {e}", "WARNING")
-    
-    # 分离正常记录和错误日志
-    sections = existing_content.split("\n" + "="*80 + "\n")
-    normal_records = []
-    error_logs = []
-    
-    for section in sections:
-        if section.strip():
-            if "ERROR" in section or "错误" in section:
-                error_logs.append(section)
-            elif "评估时间:" in section:
-                normal_records.append(section)
-    
-    # 添加新记录
+    normal_path = os.path.join(script_dir, NORMAL_RECORDS_FILE)
+    error_path = os.path.join(script_dir, ERROR_RECORDS_FILE)
+
+    # 追加新记录
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     if new_entry:
-        entry_lines = [
-            f"评估时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"评估期号: {new_entry.get('period', '未知')}",
-            f"开奖号码: {''.join(map(str, new_entry.get('prize_numbers', [])))}",
-            f"推荐数量: {new_entry.get('recommendation_count', 0)}注",
-            f"中奖数量: {new_entry.get('winning_count', 0)}注",
-            f"总奖金: {new_entry.get('total_prize', 0):,}元",
-            ""
-        ]
-        
-        if new_entry.get('winning_details'):
-            entry_lines.append("中奖详情:")
-            for detail in new_entry['winning_details']:
-                numbers_str = ''.join(map(str, detail['numbers']))
-                entry_lines.append(f"  第{detail['index']}注: {numbers_str} - {detail['prize_type']} - {detail['prize_amount']:,}元")
-            entry_lines.append("")
-        
-        normal_records.insert(0, "\n".join(entry_lines))
-    
+        _append_record(normal_path, {'time': now_str, **new_entry}, MAX_NORMAL_RECORDS)
     if new_error:
-        error_entry = f"错误时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n错误信息: {new_error}\n"
-        error_logs.insert(0, error_entry)
-    
-    # 限制记录数量
-    normal_records = normal_records[:MAX_NORMAL_RECORDS]
-    error_logs = error_logs[:MAX_ERROR_LOGS]
-    
+        _append_record(error_path, {'time': now_str, 'message': new_error}, MAX_ERROR_LOGS)
+
+    # 由结构化记录重新生成可读报告
+    normal_records = [_format_normal_record(r) for r in _load_records(normal_path, MAX_NORMAL_RECORDS)]
+    error_logs = [_format_error_record(r) for r in _load_records(error_path, MAX_ERROR_LOGS)]
+
     # 重新组合内容
     new_content_parts = []
     
@@ -367,26 +677,105 @@ def manage_report(new_entry: Optional[Dict] = None, new_error: Optional[str] = N
         new_content_parts.append("错误日志:")
         new_content_parts.extend(error_logs)
     
-    # 写入文件
+    # 写入文件: 先在 StringIO 中拼装，再经临时文件 os.replace 原子替换，
+    # 避免中途崩溃留下半截报告
     try:
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(("\n" + "="*80 + "\n").join(new_content_parts))
+        buf = io.StringIO()
+        separator = "\n" + "="*80 + "\n"
+        for i, part in enumerate(new_content_parts):
+            if i:
+                buf.write(separator)
+            buf.write(part)
+        tmp_path = report_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(buf.getvalue())
+        os.replace(tmp_path, report_path)
         log_message(f"报告已更新: {report_path}", "INFO")
     except Exception as e:
         log_message(f"写入报告失败: {e}", "ERROR")
 
+def _evaluate_single_period(eval_period: str, cutoff_period: str, prize_numbers: List[int]) -> Optional[Dict]:
+    """
+    评估单个期号的推荐表现。
+
+    查找数据截止期对应的分析报告，解析其中的单式推荐并核对该期的
+    中奖情况。不依赖任何共享可变状态，可安全地在进程池中并行执行。
+
+    Args:
+        eval_period (str): 被评估的期号。
+        cutoff_period (str): 该期对应报告的数据截止期号。
+        prize_numbers (List[int]): 该期的实际开奖号码。
+
+    Returns:
+        Optional[Dict]: 与 manage_report 评估记录同构的结果字典，
+        找不到报告或推荐时返回 None。
+    """
+    report_path, report_content = find_matching_report(cutoff_period)
+    if not report_path or not report_content:
+        return None
+
+    recommendations = parse_recommendations_from_report(report_content)['single']
+    if not recommendations:
+        return None
+
+    total_prize, prize_stats, winning_details = calculate_prize(recommendations, prize_numbers)
+    return {
+        'period': eval_period,
+        'prize_numbers': prize_numbers,
+        'recommendation_count': len(recommendations),
+        'winning_count': len(winning_details),
+        'total_prize': total_prize,
+        'winning_details': winning_details
+    }
+
+def backtest(periods: Optional[List[str]] = None, max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    并行回测历史各期推荐的实际表现。
+
+    每期的评估只依赖自己的报告文件和一行开奖数据，相互完全独立，
+    因此按期号分发到进程池并行执行，核数越多加速越接近线性。
+
+    Args:
+        periods (Optional[List[str]]): 待评估的期号列表，
+            默认回测CSV中除首期外的全部期号。
+        max_workers (Optional[int]): 并行进程数，默认由进程池自行决定。
+
+    Returns:
+        List[Dict]: 每期一条评估记录，按期号升序；缺少报告的期号被跳过。
+    """
+    period_map, periods_list = load_period_data(CSV_FILE)
+    if not period_map or not periods_list or len(periods_list) < 2:
+        return []
+
+    if periods is None:
+        periods = periods_list[1:]
+
+    # 每期的截止期是它在全量期号序列中的前一期
+    position = {p: i for i, p in enumerate(periods_list)}
+    tasks = []
+    for period in periods:
+        i = position.get(period)
+        if i:  # 首期(i==0)没有前一期，无法回测
+            tasks.append((period, periods_list[i - 1], period_map[period]['numbers']))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_evaluate_single_period, *task) for task in tasks]
+        for future in futures:
+            entry = future.result()
+            if entry:
+                results.append(entry)
+
+    results.sort(key=lambda entry: int(entry['period']))
+    return results
+
 def main_process():
     """
     主处理函数
     """
     try:
-        # 读取CSV数据
-        csv_content = robust_file_read(CSV_FILE)
-        if not csv_content:
-            raise Exception(f"无法读取CSV文件: {CSV_FILE}")
-        
-        # 解析期号数据
-        period_map, periods_list = get_period_data_from_csv(csv_content)
+        # 读取并解析CSV数据
+        period_map, periods_list = load_period_data(CSV_FILE)
         if not period_map or not periods_list:
             raise Exception("CSV数据解析失败")
         
@@ -399,16 +788,14 @@ def main_process():
         
         log_message(f"评估期: {eval_period}, 数据截止期: {data_cutoff_period}")
         
-        # 查找对应的分析报告
-        report_path = find_matching_report(data_cutoff_period)
+        # 查找对应的分析报告（内容随扫描结果一并返回，避免二次读取）
+        report_path, report_content = find_matching_report(data_cutoff_period)
         if not report_path:
             raise Exception(f"未找到数据截止期为 {data_cutoff_period} 的分析报告")
-        
-        # 解析报告中的推荐号码
-        report_content = robust_file_read(report_path)
         if not report_content:
             raise Exception(f"无法读取报告文件: {report_path}")
-        
+
+        # 解析报告中的推荐号码
         recommendations_data = parse_recommendations_from_report(report_content)
         recommendations = recommendations_data['single']
         
@@ -435,7 +822,7 @@ def main_process():
         
         # 输出结果
         log_message(f"评估完成: 期号 {eval_period}", "INFO")
-        log_message(f"开奖号码: {''.join(map(str, prize_numbers))}", "INFO")
+        log_message(f"开奖号码: {_digits_to_str(prize_numbers)}", "INFO")
         log_message(f"推荐数量: {len(recommendations)}注", "INFO")
         log_message(f"中奖数量: {len(winning_details)}注", "INFO")
         log_message(f"总奖金: {total_prize:,}元", "INFO")
@@ -443,7 +830,7 @@ def main_process():
         if winning_details:
             log_message("中奖详情:", "INFO")
             for detail in winning_details:
-                numbers_str = ''.join(map(str, detail['numbers']))
+                numbers_str = _digits_to_str(detail['numbers'])
                 log_message(f"  第{detail['index']}注: {numbers_str} - {detail['prize_type']} - {detail['prize_amount']:,}元", "INFO")
     
     except Exception as e: